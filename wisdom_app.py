@@ -1,9 +1,72 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import numba
 import plotly.graph_objects as go
 
-def simulate_collective_accuracy(num_learners, num_simulations, individual_accuracy, correlation_strength):
+# Number of learners whose uniforms are held in memory at once
+_LEARNER_BLOCK = 256
+
+# Maximum number of points sent to the browser for the convergence plot
+_MAX_PLOT_POINTS = 2000
+
+@numba.njit(inline="always", fastmath=True, cache=True)
+def _autoregressive_vote(previous, uniform, individual_accuracy, correlation_strength, noise_scale, vote_threshold):
+    """
+    Vote of a learner (1 correct, 0 incorrect) given the previous learner's vote and a uniform draw.
+    """
+    draw = 1.0 if uniform < individual_accuracy else -1.0
+    correlated_value = correlation_strength * (2 * previous - 1) + noise_scale * draw
+    return 1 if correlated_value >= vote_threshold else 0
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def _simulate_core(uniforms, first_learner, individual_accuracy, correlation_strength, previous_votes, correct_votes):
+    """
+    Advance the autoregressive model of every simulation over a block of learners.
+
+    Row s of uniforms holds the random draws of simulation s for the learners starting
+    at first_learner. previous_votes and correct_votes carry each simulation's last vote
+    and running tally from one block to the next and are updated in place. The simulations
+    are distributed over all cores.
+    """
+    num_simulations, block_size = uniforms.shape
+    noise_scale = np.sqrt(1 - correlation_strength**2)
+    # Expected value of a single learner's vote when mapped to +1 (correct) / -1 (incorrect)
+    vote_threshold = 2 * individual_accuracy - 1
+
+    for s in numba.prange(num_simulations):
+        # The state is local to each simulation so parallel iterations never share it
+        previous = previous_votes[s]
+        count = correct_votes[s]
+        for j in range(block_size):
+            if first_learner + j == 0:
+                # The first learner has no predecessor and is drawn at random
+                previous = 1 if uniforms[s, j] < individual_accuracy else 0
+            else:
+                previous = _autoregressive_vote(previous, uniforms[s, j], individual_accuracy,
+                                                correlation_strength, noise_scale, vote_threshold)
+            count += previous
+        previous_votes[s] = previous
+        correct_votes[s] = count
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def _simulate_independent(uniforms, individual_accuracy, correct_votes):
+    """
+    Add the correct votes of a block of independent learners to the tally of every simulation.
+
+    Specialization of _simulate_core for a correlation strength of 0, where the recurrence
+    drops out and every vote is a plain Bernoulli draw.
+    """
+    num_simulations, block_size = uniforms.shape
+
+    for s in numba.prange(num_simulations):
+        count = 0
+        for j in range(block_size):
+            if uniforms[s, j] < individual_accuracy:
+                count += 1
+        correct_votes[s] += count
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def simulate_collective_accuracy(num_learners, num_simulations, individual_accuracy, correlation_strength, seed):
     """
     Simulate collective accuracy based on correlated individual estimates.
 
@@ -12,9 +75,12 @@ def simulate_collective_accuracy(num_learners, num_simulations, individual_accur
     - num_simulations (int): Number of simulation runs.
     - individual_accuracy (float): Probability of an individual learner making a correct estimate.
     - correlation_strength (float): Strength of correlation among individual estimates.
+    - seed (int): Seed of the random number generator, making the results reproducible.
 
     Returns:
     - float: Mean collective accuracy across all simulations.
+    - numpy.ndarray: Collective accuracy (majority decision) of each simulation.
+    - numpy.ndarray: Running mean of the collective accuracy over the simulations.
 
     Description:
     The function simulates a scenario where multiple learners provide individual estimates,
@@ -23,8 +89,12 @@ def simulate_collective_accuracy(num_learners, num_simulations, individual_accur
     initialized randomly, and subsequent estimates are correlated with the previous ones.
     The final collective accuracy is calculated based on the majority decision for each simulation.
     
-    The code uses vectorized operations to optimize performance, making use of NumPy's
-    capabilities for efficient array computations.
+    The computation depends on the correlation strength. With a correlation strength of 1 or -1
+    only the first learner is random, and the number of correct votes follows directly from it.
+    With a correlation strength of 0 the learners are tallied by the parallel numba kernel
+    _simulate_independent. Any other value runs the autoregressive model in the numba kernel
+    _simulate_core. Both kernels process the learners in blocks and keep only a running tally
+    per simulation.
 
     Correlation Scenarios:
     - When correlation_strength is 0, there is no correlation among individual estimates.
@@ -38,30 +108,59 @@ def simulate_collective_accuracy(num_learners, num_simulations, individual_accur
 
     - When correlation_strength is -1, there is perfect negative correlation among individual estimates.
       If one learner makes a correct estimate, all others will make incorrect estimates, and vice versa.
+
+    The results are cached by Streamlit, so reruns with the same inputs and seed are free.
     """
 
-    # Initialize arrays for individual estimates and collective accuracies
-    individual_estimates = np.zeros((num_simulations, num_learners), dtype=bool)
-    collective_accuracies = np.zeros(num_simulations, dtype=int)
+    rng = np.random.default_rng(seed)
+    accuracy_threshold = np.float32(individual_accuracy)
+    majority = num_learners // 2 + 1
+
+    # With perfect correlation only the first learner is random and the number of
+    # correct votes per simulation follows directly from it
+    if abs(correlation_strength) == 1:
+        first_estimates = rng.random(num_simulations, dtype=np.float32) < accuracy_threshold
+        if correlation_strength == 1:
+            # Perfect positive correlation: every learner repeats the first one
+            correct_votes = first_estimates * num_learners
+        else:
+            # Perfect negative correlation: learners alternate between right and wrong,
+            # so the first learner's side gets the extra vote when the count is odd
+            correct_votes = np.where(first_estimates, (num_learners + 1) // 2, num_learners // 2)
+    else:
+        # Draw the learners block by block into one reused float32 buffer and keep only
+        # a running tally per simulation instead of the full matrix of estimates
+        correct_votes = np.zeros(num_simulations, dtype=np.int32)
+        previous_votes = np.zeros(num_simulations, dtype=np.int8)
+        buffer = np.empty(num_simulations * min(num_learners, _LEARNER_BLOCK), dtype=np.float32)
+
+        for first_learner in range(0, num_learners, _LEARNER_BLOCK):
+            block_size = min(_LEARNER_BLOCK, num_learners - first_learner)
+            uniforms = buffer[:num_simulations * block_size].reshape(num_simulations, block_size)
+            rng.random(dtype=np.float32, out=uniforms)
+
+            if correlation_strength == 0:
+                # Independent learners: every estimate is its own Bernoulli draw
+                _simulate_independent(uniforms, accuracy_threshold, correct_votes)
+            else:
+                # Any other correlation strength runs the full autoregressive model
+                _simulate_core(uniforms, first_learner, accuracy_threshold, correlation_strength,
+                               previous_votes, correct_votes)
 
-    # Initialize the first individual estimate randomly for each simulation
-    individual_estimates[:, 0] = np.random.choice([1, 0], size=num_simulations, p=[individual_accuracy, 1 - individual_accuracy])
+    # Check collective accuracy for all simulations
+    collective_accuracies = correct_votes >= majority
 
-    # Simulate individual estimates for the remaining learners and all simulations
-    for i in range(1, num_learners):
-        correlated_values = (
-            correlation_strength * (2*individual_estimates[:, i-1].astype(int) -1 )
-            + np.sqrt(1 - correlation_strength**2) * np.random.choice([1, 0], size=num_simulations, p=[individual_accuracy, 1 - individual_accuracy])
-        )
-        individual_estimates[:, i] = np.clip(correlated_values, 0, 1) >= np.array(individual_accuracy)
+    # Running mean of the collective accuracy for the convergence plot, built in a single float32 buffer
+    cumulative_accuracies = np.empty(num_simulations, dtype=np.float32)
+    np.cumsum(collective_accuracies, dtype=np.float32, out=cumulative_accuracies)
 
-    # Check collective accuracy for all simulations
-    collective_accuracies = np.sum(individual_estimates, axis=1) >= num_learners // 2 + 1
+    # The last cumulative sum is the exact number of correct simulations, so the mean
+    # collective accuracy needs no second reduction
+    mean_collective = float(cumulative_accuracies[-1]) / num_simulations
 
-    # Calculate the mean collective accuracy
-    mean_collective = np.mean(collective_accuracies)
+    cumulative_accuracies /= np.arange(1, num_simulations + 1, dtype=np.float32)
 
-    return mean_collective, collective_accuracies
+    return mean_collective, collective_accuracies, cumulative_accuracies
 
 # Streamlit App
 def main():
@@ -70,34 +169,36 @@ def main():
     # Brief description
     st.write(
         "This app simulates the collective accuracy of an ensemble of learners with varying individual accuracies "
-        "and correlation among their estimates. Adjust the simulation settings in the sidebar to observe how the "
-        "collective accuracy evolves over multiple simulations"
+        "and correlation among their estimates. Adjust the simulation settings in the sidebar and press Run Simulation "
+        "to observe how the collective accuracy evolves over multiple simulations"
     )
 
     # Sidebar
     st.sidebar.header("Simulation Settings")
-    num_learners = st.sidebar.slider("Number of Learners", min_value=1, max_value=5000, value=100)
-    num_simulations = st.sidebar.slider("Number of Simulations", min_value=1, max_value=50000, value=25000)
-    individual_accuracy = st.sidebar.slider("Individual Accuracy", min_value=0.1, max_value=1.0, value=0.51, step=0.01)
-    correlation_strength = st.sidebar.slider("Correlation Strength", min_value=-1.0, max_value=1.0, value=0.0, step=1.0, format="%d")
+    # The settings live in a form, so the app only reruns when they are submitted
+    with st.sidebar.form("sim_params"):
+        num_learners = st.slider("Number of Learners", min_value=1, max_value=5000, value=100)
+        num_simulations = st.slider("Number of Simulations", min_value=1, max_value=50000, value=25000)
+        individual_accuracy = st.slider("Individual Accuracy", min_value=0.1, max_value=1.0, value=0.51, step=0.01)
+        correlation_strength = st.slider("Correlation Strength", min_value=-1.0, max_value=1.0, value=0.0, step=1.0, format="%d")
+        seed = st.number_input("Random Seed", min_value=0, value=42, step=1)
+        st.form_submit_button("Run Simulation")
 
     # Simulation
-    mean_collective, collective_accuracies= simulate_collective_accuracy(num_learners, num_simulations, individual_accuracy, correlation_strength)
-    cumulative_accuracies = np.cumsum(collective_accuracies) / np.arange(1, num_simulations + 1)
+    mean_collective, collective_accuracies, cumulative_accuracies = simulate_collective_accuracy(
+        num_learners, num_simulations, individual_accuracy, correlation_strength, seed
+    )
 
-    # Individual Estimates
-    individual_estimates = np.zeros((num_simulations, num_learners), dtype=bool)
-    for i in range(num_learners):
-        individual_estimates[:, i] = np.random.choice([1, 0], size=num_simulations, p=[individual_accuracy, 1 - individual_accuracy])
+    # The running mean is smooth, so an evenly spaced subset of points draws the same curve
+    if num_simulations > _MAX_PLOT_POINTS:
+        plot_indices = np.linspace(0, num_simulations - 1, _MAX_PLOT_POINTS).astype(np.int64)
+    else:
+        plot_indices = np.arange(num_simulations)
 
-    
-
-  
-   
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=np.arange(1, num_simulations + 1), y=cumulative_accuracies,
-                             mode='lines', name='Collective Accuracy',
-                             line=dict(color='#4a7c59', dash='dash', width=2)))
+    fig.add_trace(go.Scattergl(x=plot_indices + 1, y=cumulative_accuracies[plot_indices],
+                               mode='lines', name='Collective Accuracy',
+                               line=dict(color='#4a7c59', dash='dash', width=2)))
     fig.update_layout(
         xaxis=dict(title='Number of Simulations'),
         yaxis=dict(title='Collective Accuracy'),